@@ -1,6 +1,5 @@
-import re
-
-import yaml
+import copy
+import functools
 
 ALTIUMATE_VERSION = "v0.4.1"
 DEFAULT_RUN_TIMEOUT = 60.0
@@ -62,39 +61,69 @@ _repo_remote = {
 }
 
 
+class _BlockMapping(dict):
+    """Mapping always dumped in YAML block style"""
+
+
+@functools.cache
+def _dumper():
+    """Returns a SafeDumper that dumps _BlockMapping in block style"""
+    try:
+        from yaml import CSafeDumper as SafeDumper
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeDumper
+
+    class Dumper(SafeDumper):
+        pass
+
+    Dumper.add_representer(
+        _BlockMapping,
+        lambda dumper, data: dumper.represent_mapping(
+            "tag:yaml.org,2002:map", data, flow_style=False
+        ),
+    )
+    return Dumper
+
+
 def dump_config(config: dict, **kwargs) -> str:
     """Dumps the pre-commit configuration to a YAML string"""
-    fltr = r"\n\s*args:\s*\[\]|(?=\n|$)"
-    return re.sub(
-        fltr,
-        "",
-        yaml.dump(
-            data=config,
-            indent=2,
-            sort_keys=False,
-            default_flow_style=kwargs.pop("default_flow_style", None),
-            **kwargs,
-        ),
+    import yaml
+
+    return yaml.dump(
+        data=config,
+        Dumper=_dumper(),
+        indent=2,
+        sort_keys=False,
+        default_flow_style=kwargs.pop("default_flow_style", None),
+        **kwargs,
     )
 
 
+def _strip_empty_args(hook: dict) -> _BlockMapping:
+    """Returns a copy of the hook without an empty args list"""
+    return _BlockMapping((k, v) for k, v in hook.items() if k != "args" or v)
+
+
+@functools.lru_cache(maxsize=2)
 def sample_config_yaml(_type: str) -> str:
     """Returns a sample pre-commit configuration file for an Altium Designer PCB project
 
     Args:
         _type (str): "remote" or "local"
     """
-    conf = _header
+    conf = copy.deepcopy(_header)
     if _type == "remote":
-        conf["repos"] = [_repo_remote]
+        repo = copy.deepcopy(_repo_remote)
         for hook in _hooks:
-            part = {k: hook[k] for k in ("id", "args")}
+            part = _strip_empty_args({k: hook[k] for k in ("id", "args")})
             part["language"] = "python"
-            conf["repos"][0]["hooks"].append(part)
+            repo["hooks"].append(part)
+        conf["repos"] = [repo]
         return dump_config(conf)
     elif _type == "local":
-        conf = _header.copy()
-        conf["repos"] = [_repo_local]
+        repo = copy.deepcopy(_repo_local)
+        repo["hooks"] = [_strip_empty_args(hook) for hook in repo["hooks"]]
+        conf["repos"] = [repo]
         return dump_config(conf)
     else:
         raise ValueError(f"Invalid type: {_type}")
@@ -1,17 +1,16 @@
 import argparse
+import functools
 import logging
+import logging.handlers
+import mmap
 import os
 import pathlib as pl
 import re
-import subprocess
+import stat
 import sys
 import time
-import winreg as wr
 from collections.abc import Sequence
 
-import psutil
-from humanize import naturaldelta as human_time
-
 from altiumate.config import ALTIUMATE_VERSION, DEFAULT_RUN_TIMEOUT, sample_config_yaml
 
 
@@ -25,6 +24,19 @@ def eopen(
 
 altiumate_dir = pl.Path(__file__).parent
 AD_return_file = altiumate_dir / "AD_out"
+ALTIUM_EXE = "X2.exe"
+_AD_POSIX = AD_return_file.as_posix()
+_PAS_PATH = altiumate_dir / "AD_scripting" / "altiumate.pas"
+installs_cache_file = altiumate_dir / ".altium_installs.json"
+pid_cache_file = altiumate_dir / ".altium_pid"
+_PRJSCR = (altiumate_dir / "AD_scripting" / "precommit.PrjScr").absolute()
+
+_CONST_LINE = "  {k} = '{v}';".format
+_INSERT_RE = re.compile(r"\[\]\((.*?)\)(.*?)\[\]\(/\)")
+_PARAM_RE = re.compile(
+    rb"^\[Parameter\d+\]\r?\nName=(?P<name>[^\r\n]*)\r?\nValue=(?P<value>[^\r\n]*)",
+    re.MULTILINE,
+)
 
 logger = logging.getLogger("altiumate")
 logger.setLevel(logging.DEBUG)
@@ -49,22 +61,33 @@ class Formatter(logging.Formatter):
         logging.CRITICAL: bold_red,
     }
 
-    def __fmt(self, lvl):
-        return self.FORMATS.get(lvl, self.grey) + self.fmt + self.reset
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._styles = {
+            lvl: logging.PercentStyle(color + self.fmt + self.reset)
+            for lvl, color in self.FORMATS.items()
+        }
+        self._default_style = logging.PercentStyle(self.grey + self.fmt + self.reset)
 
     def format(self, record):
-        self._style._fmt = self.__fmt(record.levelno)
+        self._style = self._styles.get(record.levelno, self._default_style)
         return super().format(record)
 
 
-f_log = logging.FileHandler((altiumate_dir / ".altiumate.log"), mode="a")
+f_log = logging.FileHandler((altiumate_dir / ".altiumate.log"), mode="a", delay=True)
 f_log.setFormatter(logging.Formatter(Formatter.fmt))
-logger.addHandler(f_log)
+# records are written in batches, errors and interpreter exit flush the buffer
+b_log = logging.handlers.MemoryHandler(
+    256, flushLevel=logging.ERROR, target=f_log, flushOnClose=True
+)
 
 o_log = logging.StreamHandler()
 o_log.setLevel(logging.WARN)
 o_log.setFormatter(Formatter())
-logger.addHandler(o_log)
+
+if not logger.handlers:
+    logger.addHandler(b_log)
+    logger.addHandler(o_log)
 
 
 def get_subparser(
@@ -94,25 +117,180 @@ def read_altium_path():
     return pl.Path(altium_exe)
 
 
+def _cached_altium_process() -> pl.Path | None:
+    """Returns AD executable of the last found process if it is still running"""
+    from altiumate.win32 import process_image_path
+
+    try:
+        with eopen(pid_cache_file) as f:
+            pid, exe = f.read().split("\n", 1)
+        # a reused pid belongs to a different executable
+        if process_image_path(int(pid)) == exe:
+            return pl.Path(exe)
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
+
+
+def _cache_altium_process(pid: int, exe: str):
+    """Remembers the found AD process for the next invocation"""
+    try:
+        with eopen(pid_cache_file, "w") as f:
+            f.write(f"{pid}\n{exe}")
+    except OSError as e:
+        logger.debug("Unable to write AD process cache: %s", e)
+
+
 def find_altium_process() -> pl.Path | None:
     """Finds the X2.exe process in the process list.
 
+    The last found process is checked first, the process list is walked only \
+        when it is no longer running.
+
     Returns:
         pl.Path|None: Path to Altium Designer executable if found, else None
     """
-    for p in psutil.process_iter(["name", "exe"]):
-        if "x2.exe" == p.name().lower():
-            return pl.Path(p.exe())
+    from altiumate.win32 import find_process
+
+    if (cached := _cached_altium_process()) is not None:
+        return cached
+    try:
+        found = find_process(ALTIUM_EXE)
+    except (AttributeError, OSError) as e:
+        logger.debug("Process snapshot failed (%s), falling back to psutil", e)
+    else:
+        if found is None:
+            return None
+        _cache_altium_process(*found)
+        return pl.Path(found[1])
+    import psutil
+
+    target = ALTIUM_EXE.lower()
+    for p in psutil.process_iter(["name"]):
+        if (p.info["name"] or "").lower() != target:
+            continue
+        try:  # exe is only needed for the matching process
+            exe = p.exe()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        _cache_altium_process(p.pid, exe)
+        return pl.Path(exe)
     return None
 
 
+def _version_key(version: str) -> tuple[int, ...]:
+    return tuple(int(n) for n in re.findall(r"\d+", version))
+
+
+def _exe_stamp(path: str) -> list[int] | None:
+    """Returns modification time and size of the executable, None if it is missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _read_installs_cache(modified: int) -> dict[str, pl.Path] | None:
+    """Returns AD installations cached for the given registry key write time"""
+    import json
+
+    try:
+        with eopen(installs_cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        if not isinstance(cache, dict) or cache.get("modified") != modified:
+            logger.info("AD installations cache is outdated")
+            return None
+        installs = {}
+        for ver, entry in cache.get("installs").items():
+            # in-place updates rewrite the build subkey and its files, not the Builds key
+            if _exe_stamp(entry["path"]) != entry["stamp"]:
+                logger.info("AD installation %s changed since it was cached", ver)
+                return None
+            installs[ver] = pl.Path(entry["path"])
+    except (KeyError, TypeError, AttributeError):
+        logger.info("AD installations cache is malformed")
+        return None
+    return installs or None
+
+
+def _write_installs_cache(modified: int, installs: dict[str, pl.Path]):
+    """Stores AD installations with the registry key write time they were read at \
+        and the current state of their executables"""
+    import json
+
+    cache = {
+        "modified": modified,
+        "installs": {
+            ver: {"path": str(path), "stamp": _exe_stamp(path)}
+            for ver, path in installs.items()
+        },
+    }
+    try:
+        with eopen(installs_cache_file, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        logger.warning("Unable to write AD installations cache: %s", e)
+
+
+@functools.lru_cache(maxsize=1)
+def altium_installs() -> dict[str, pl.Path]:
+    """Reads Altium Designer installations from Windows registry.
+
+    Enumerated builds are cached in a file next to altiumate and reused for as long \
+        as the last write time of the registry key and the executables stay the same.
+
+    Raises:
+        FileNotFoundError: If the registry key is missing or contains no builds
+
+    Returns:
+        dict[str, pl.Path]: AD version mapped to its executable, newest first
+    """
+    import winreg as wr
+
+    fail = FileNotFoundError("Altium Designer is not installed on this computer")
+    open_key, enum_key, query_value = wr.OpenKeyEx, wr.EnumKey, wr.QueryValueEx
+    # AD is 64-bit, skip WOW64 redirection when running under 32-bit Python
+    access = wr.KEY_READ | wr.KEY_WOW64_64KEY
+    try:
+        with open_key(
+            wr.HKEY_LOCAL_MACHINE, "SOFTWARE\\Altium\\Builds", 0, access
+        ) as key:
+            count, _, modified = wr.QueryInfoKey(key)
+            installs = _read_installs_cache(modified)
+            if installs is None:
+                installs = {}
+                for i in range(count):
+                    with open_key(key, enum_key(key, i), 0, access) as subkey:
+                        installs[query_value(subkey, "Version")[0]] = pl.Path(
+                            query_value(subkey, "ProgramsInstallPath")[0], ALTIUM_EXE
+                        )
+                if installs:
+                    _write_installs_cache(modified, installs)
+    except FileNotFoundError as e:
+        logger.critical("AD registry key not found")
+        raise fail from e
+    except WindowsError as e:
+        logger.critical("Registry access failed! %s", e)
+        raise fail from e
+    if not installs:
+        raise fail
+    logger.info("Found Altium Designer installations: %s", installs)
+    return {
+        ver: installs[ver] for ver in sorted(installs, key=_version_key, reverse=True)
+    }
+
+
 def get_altium_path(
     version: str | None = None,
-):  # TODO: maybe add 'latest' as an option
+):
     """Returns the path to Altium Designer executable.
 
     If version is specified, executable will be selected using string matching, else \
-        the already opened or the first instance found in Windows registry will be returned.\
+        the already opened or the latest instance found in Windows registry will be returned.\
         'any' can be used as a version placehoder.
 
     Raises:
@@ -130,22 +308,7 @@ def get_altium_path(
         if path:
             return path
 
-    fail = FileNotFoundError("Altium Designer is not installed on this computer")
-    installs = {}
-    try:
-        with wr.OpenKey(wr.HKEY_LOCAL_MACHINE, "SOFTWARE\\Altium\\Builds") as key:
-            for i in range(wr.QueryInfoKey(key)[0]):
-                with wr.OpenKey(key, wr.EnumKey(key, i)) as subkey:
-                    installs[wr.QueryValueEx(subkey, "Version")[0]] = pl.Path(
-                        wr.QueryValueEx(subkey, "ProgramsInstallPath")[0], "X2.exe"
-                    )
-    except FileNotFoundError as e:
-        logger.critical("AD registry key not found")
-        raise fail from e
-    except WindowsError as e:
-        logger.critical("Registry access failed! {e}")
-        raise fail from e
-    logger.info(f"Found Altium Designer installations: {installs}")
+    installs = altium_installs()
     if version:
         filtered = list(filter(lambda x: x.startswith(version), installs.keys()))
         if len(filtered) == 0:
@@ -155,8 +318,16 @@ def get_altium_path(
                 f"Multiple versions found for '{version}': {filtered}. Provide more specific version"
             )
         return installs[filtered[0]]
-    for ver in installs:
-        return installs[ver]
+    return next(iter(installs.values()))
+
+
+def find_project_file(directory: str | None = None) -> pl.Path | None:
+    """Returns the first Altium project file found in the directory, cwd by default"""
+    with os.scandir(directory or os.getcwd()) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(".prjpcb") and entry.is_file():
+                return pl.Path(entry.path)
+    return None
 
 
 def add_project_path(parser: argparse.ArgumentParser):
@@ -164,32 +335,12 @@ def add_project_path(parser: argparse.ArgumentParser):
         "project_path",
         help="Altium project file to use, defaults to first found in cwd",
         type=pl.Path,
-        default=next(pl.Path.cwd().glob("*.PrjPcb"), None),
         nargs=argparse.OPTIONAL,
     )
 
 
-def render_constants(
-    call_procedure: str = "test_altiumate", terminate: bool = False, **params: str
-):
-    """Renders the altiumate.pas file with the provided parameters.
-
-    call_procedure: str: Internals of the function that will be called. ';' is appended after this text if needed. Defaults to "test_altiumate"
-    terminate: bool: Whether to terminate AD after script execution. Defaults to False
-    params: dict[str, str]: Parameters to render in the altiumate.pas file as constants
-    """
-    AD_return_file.unlink(True)
-    if call_procedure[-1] != ";":
-        call_procedure += ";"
-    with eopen(altiumate_dir / "AD_scripting" / "altiumate.pas", "w") as f_dst:
-        header = (
-            f"Const\n{'\n'.join(f"  {k} = '{v}';" for k, v in params.items())}\n"
-            if params
-            else ""
-        )
-
-        f_dst.write(
-            f"""{header}Var
+# static parts of altiumate.pas, only constants and the called procedure vary
+_PAS_HEAD = f"""Var
   return_code: integer;
 
 Procedure RunFromAltiumate;
@@ -197,18 +348,57 @@ Var
   tmp_file: TextFile;
 Begin
   return_code := 1;
-  AssignFile(tmp_file, '{AD_return_file.as_posix()}');
+  AssignFile(tmp_file, '{_AD_POSIX}');
   Try
-    {call_procedure}
+    """
+_PAS_TAIL = """
   Finally
     ReWrite(tmp_file);
     WriteLn(tmp_file, return_code);
     CloseFile(tmp_file);
   end;
-  {"TerminateWithExitCode(return_code);" if terminate else ""}
+  {}
 End;
-"""
-        )
+""".format
+_PAS_TAIL_TERMINATE = {
+    True: _PAS_TAIL("TerminateWithExitCode(return_code);"),
+    False: _PAS_TAIL(""),
+}
+
+
+def render_constants(
+    call_procedure: str = "test_altiumate", terminate: bool = False, **params: str
+):
+    """Renders the altiumate.pas file with the provided parameters.
+
+    call_procedure: str: Internals of the function that will be called. ';' is appended after this text if needed. Defaults to "test_altiumate"
+    terminate: bool: Whether to terminate AD after script execution. Defaults to False
+    params: dict[str, str]: Parameters to render in the altiumate.pas file as constants
+    """
+    import hashlib
+
+    AD_return_file.unlink(True)
+    if call_procedure[-1] != ";":
+        call_procedure += ";"
+    header = (
+        "Const\n" + "\n".join([_CONST_LINE(k=k, v=v) for k, v in params.items()]) + "\n"
+        if params
+        else ""
+    )
+    script = "".join(
+        (header, _PAS_HEAD, call_procedure, _PAS_TAIL_TERMINATE[bool(terminate)])
+    )
+    # the first line holds a hash of the script, so an unchanged script is not rewritten
+    digest = hashlib.blake2b(script.encode(), digest_size=12).hexdigest()
+    signature = f"// altiumate-sig: {digest}\n"
+    try:
+        with eopen(_PAS_PATH) as f_src:
+            if f_src.readline() == signature:
+                return logger.debug("%s is up to date", _PAS_PATH.name)
+    except FileNotFoundError:
+        pass
+    with eopen(_PAS_PATH, "w") as f_dst:
+        f_dst.write(signature + script)
 
 
 def _register_pre_commit(parser: argparse.ArgumentParser):
@@ -250,46 +440,63 @@ def _register_pre_commit(parser: argparse.ArgumentParser):
 
 def _handle_pre_commit(args: argparse.Namespace, parser: argparse.ArgumentParser):
     if args.print_config:
-        logger.info(f"Printing {args.print_config} config")
+        logger.info("Printing %s config", args.print_config)
         print(sample_config_yaml(args.print_config))
         return 0
     elif args.add_config_file or args.add_linked_config:
         dir_to_add: pl.Path = args.add_config_file or args.add_linked_config
 
         if not dir_to_add.is_dir():
-            return logger.error(f"Provided path {dir_to_add} is not a directory")
+            return logger.error("Provided path %s is not a directory", dir_to_add)
         out = dir_to_add / ".pre-commit-config.yaml"
         if out.exists() and not args.force:
             return logger.error(
-                f"Config file {out} already exists. Use --force to overwrite"
+                "Config file %s already exists. Use --force to overwrite", out
             )
 
         if args.add_config_file:
-            logger.info(f"Creating pre-commit config file in {dir_to_add}")
-            with eopen(args.add_config_file / ".pre-commit-config.yaml", "w") as f:
-                f.write(sample_config_yaml("remote"))
+            logger.info("Creating pre-commit config file in %s", dir_to_add)
+            out.write_text(sample_config_yaml("remote"), encoding="utf_8")
         else:
             conf = altiumate_dir / ".linked-config.yaml"
             if not conf.exists():
                 logger.info(
-                    f"Creating config file for linking in {altiumate_dir}. All linked configs will point to this file"
+                    "Creating config file for linking in %s. All linked configs will point to this file",
+                    altiumate_dir,
                 )
-                with eopen(conf, "w") as f:
-                    f.write(sample_config_yaml("local"))
-            out.unlink(True)
-            logger.info(f"Creating hard link to {conf} in {dir_to_add}")
-            return out.hardlink_to(conf)
-
-        return logger.info(f"Pre-commit config file created in {dir}")
+                conf.write_text(sample_config_yaml("local"), encoding="utf_8")
+            logger.info("Creating hard link to %s in %s", conf, dir_to_add)
+            try:
+                return os.link(conf, out)
+            except FileExistsError:
+                os.unlink(out)
+                return os.link(conf, out)
+
+        return logger.info("Pre-commit config file created in %s", dir_to_add)
     elif args.install:
-        logger.info("Running 'pre-commit install' command")
+        try:
+            from pre_commit.main import main as pre_commit_main
+        except ImportError:
+            pre_commit_main = None
+        if pre_commit_main is not None:
+            logger.info("Running pre-commit install in-process")
+            return pre_commit_main(["install"])
+        import shutil
+        import subprocess
+
+        if (pre_commit := shutil.which("pre-commit")) is None:
+            logger.error("pre-commit not found, install it and add it to PATH")
+            return 1
+        logger.info("Running '%s install' command", pre_commit)
         proc: subprocess.CompletedProcess = subprocess.run(
-            "pre-commit install",
+            [pre_commit, "install"],
             capture_output=True,
-            text=True,
         )
-        print(proc.stdout.rstrip())
-        return proc.stderr and logger.error(proc.stderr.rstrip())
+        sys.stdout.buffer.write(proc.stdout.rstrip() + b"\n")
+        sys.stdout.flush()
+        if proc.stderr:
+            logger.error(proc.stderr.decode("utf_8", errors="replace").rstrip())
+        return proc.returncode
     else:
         parser.print_usage()
         return 1
@@ -304,7 +511,7 @@ def _register_run(parser: argparse.ArgumentParser):
     )
     parser.add_argument(
         "--timeout",
-        help=f"Timeout for AD script runtime in seconds. Defaults to {human_time(DEFAULT_RUN_TIMEOUT)}",
+        help="Timeout for AD script runtime in seconds. Defaults to %(default)s seconds",
         dest="timeout",
         default=DEFAULT_RUN_TIMEOUT,
     )
@@ -350,11 +557,22 @@ def _register_run(parser: argparse.ArgumentParser):
     add_project_path(sp)
 
 
-def file_exists(f: pl.Path) -> pl.Path:
-    return f and f.exists() and f.is_file()
+def file_exists(f: pl.Path | None) -> bool:
+    if not f:
+        return False
+    try:
+        return stat.S_ISREG(os.stat(f).st_mode)
+    except OSError:
+        return False
 
 
 def _handle_run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    import subprocess
+
+    from humanize import naturaldelta as human_time
+
+    from altiumate.win32 import ChangeNotification
+
     altium = get_altium_path(args.AD_version)
     if args.run_cmd not in subparsers_names(parser):
         parser.error("Provide a command to run")
@@ -365,19 +583,24 @@ def _handle_run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> in
             parser.error(
                 "Provide a procedure name or files to pass to test_altiumate script"
             )
-        logger.info(f"Changed files: {args.file}")
+        logger.info("Changed files: %s", args.file)
         f_ext = {f.suffix for f in args.file}
-        logger.debug(f"Modified extensions: {f_ext}")
+        logger.debug("Modified extensions: %s", f_ext)
 
+        cwd = os.getcwd()
+        passed_files = [
+            f if os.path.isabs(f) else os.path.join(cwd, f)
+            for f in map(os.fspath, args.file)
+        ]
         render_constants(
-            passed_files=",".join(str(f.absolute()) for f in args.file),
+            passed_files=",".join(passed_files),
             call_procedure=args.procedure or "test_altiumate",
             terminate=args.terminate,
         )
-    elif not file_exists(
-        args.project_path
-    ):  # project_path is required for other commands
-        parser.error("Project file not found")
+    else:  # project_path is required for other commands
+        args.project_path = args.project_path or find_project_file()
+        if not file_exists(args.project_path):
+            parser.error("Project file not found")
     if args.run_cmd == "outjob":
         if args.outjob_name:
             to_run = f"outjob_run_all('{args.project_path.absolute()}', '{args.outjob_name}')"
@@ -400,53 +623,76 @@ def _handle_run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> in
             terminate=args.terminate,
         )
 
-    cmd = f"{altium} -RScriptingSystem:RunScript(ProjectName={(altiumate_dir / 'AD_scripting' / 'precommit.PrjScr').absolute()}|ProcName=altiumate.pas>RunFromAltiumate)"
+    cmd = [
+        str(altium),
+        f"-RScriptingSystem:RunScript(ProjectName={_PRJSCR}|ProcName=altiumate.pas>RunFromAltiumate)",
+    ]
 
     try:
         max_run_time = float(args.timeout)
     except Exception:
         logger.error(
-            f"Invalid timeout value '{args.timeout}', using default {human_time(DEFAULT_RUN_TIMEOUT)} "
+            "Invalid timeout value '%s', using default %s",
+            args.timeout,
+            human_time(DEFAULT_RUN_TIMEOUT),
         )
         max_run_time = DEFAULT_RUN_TIMEOUT
     assert max_run_time > 3, "Timeout must be larger than 3 seconds"
     assert max_run_time < 3600, "Timeout must be less than 1 hour"
 
-    proc_start = time.time()
-
-    proc = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        shell=False,  # More secure
-    )
-    # if AD is already opened, the subprocess returns before the script has finished executing
-    # solution is creating a file containing exit code from inside AD and waiting for it to appear in altiumate
+    proc_start = time.monotonic()
 
     timeout = False
-    while not (
-        (  # file is created after ReWrite command in AD, wait a little to write to the file and close it
-            AD_return_file.exists()
-            and (time.time() - os.path.getmtime(AD_return_file)) > 0.1
+    with ChangeNotification(altiumate_dir) as notification:
+        if not notification.active:
+            logger.info("Directory change notifications unavailable, polling")
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=False,  # More secure
         )
-        or timeout
-    ):
-        timeout = (time.time() - proc_start) > max_run_time
-        time.sleep(0.3)
+        # if AD is already opened, the subprocess returns before the script has finished executing
+        # solution is creating a file containing exit code from inside AD and waiting for it to appear in altiumate
+        notification.watch_process(proc.pid)
+
+        launcher_running = True
+        while True:
+            # file is created after ReWrite command in AD, wait a little to write to the file and close it
+            try:  # mtime is wall-clock time, the timeout is measured on the monotonic clock
+                age = time.time() - os.stat(AD_return_file).st_mtime
+            except FileNotFoundError:
+                age = None
+            if age is not None and age > 0.1:
+                break
+            remaining = max_run_time - (time.monotonic() - proc_start)
+            if timeout := remaining <= 0:
+                break
+            notification.wait(0.1 if age is not None else remaining)
+            if launcher_running and proc.poll() is not None:
+                launcher_running = False
+                logger.debug("AD launcher exited with code %s", proc.returncode)
+                # launcher either handed the script over to a running AD or was AD itself
+                if not AD_return_file.exists() and find_altium_process() is None:
+                    raise ChildProcessError(
+                        f"AD exited with code {proc.returncode} without finishing the script"
+                    )
     if timeout:
         raise TimeoutError(
             "AD took too long! Try setting a higher timeout with --timeout option"
         )
-    logger.info(f"Task took {human_time(time.time() - proc_start)}")
+    logger.info("Task took %s", human_time(time.monotonic() - proc_start))
 
-    with eopen(AD_return_file) as fp:
-        code = fp.readline()
-        try:
-            int(code)
-        except Exception:
-            logger.error(f"Invalid return code: {code}")
-            return 1
-        return int(code)
+    fd = os.open(AD_return_file, os.O_RDONLY)
+    try:
+        code = os.read(fd, 32)
+    finally:
+        os.close(fd)
+    try:
+        return int(code.split()[0])
+    except (IndexError, ValueError):
+        logger.error("Invalid return code: %r", code)
+        return 1
 
 
 def parse_prjpcb_params(
@@ -459,37 +705,14 @@ def parse_prjpcb_params(
     Returns:
         dict[str, str]: A dictionary of parameters found in the project file
     """
-    logger.info(f"Reading parameters from {prjpcb}")
-    # reading = None
-    # store = {}
+    logger.info("Reading parameters from %s", prjpcb)
     out = {}
-    with eopen(prjpcb) as f:
-
-        def f_iter(f):
-            for line in f:
-                yield line.splitlines()[0]
-
-        f_i = f_iter(f)
-        check = re.compile(r"\[Parameter[0-9]")
-        for line in f_i:
-            # if reading is None:
-            #     if '[' and line.endswith(']'):
-            #         print(repr(line))
-            #         reading = line.strip('[]')
-            #         if reading.startswith('ProjectVariant'):
-            #             reading = 'ProjectVariant'
-            #             store = {'Description': None, 'ParameterCount': None}
-            #         break
-            # else:
-            #     if not line and reading != 'ProjectVariant' or all(store.values()):
-            #         reading = None
-            #     if reading == 'Design':
-            #         out.update([line.split('=', 1)])
-
-            if check.match(line):  # Check for parameter section
-                name = next(f_i).split("=", 1)[1]
-                out[name] = next(f_i).split("=", 1)[1]
-    logger.debug(f"Parameters: {out}")
+    with open(prjpcb, "rb") as f:
+        if os.fstat(f.fileno()).st_size:  # empty files can't be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for m in _PARAM_RE.finditer(data):
+                    out[m["name"].decode("utf_8")] = m["value"].decode("utf_8")
+    logger.debug("Parameters: %s", out)
     return out
 
 
@@ -513,25 +736,34 @@ def update_readme(
 
     """
     inserted = 0
-    with eopen(readme) as f:
-        data = f.read()
-        insert_pattern = r"\[\]\((.*?)\)(.*?)\[\]\(/\)"
-
-        def replacer(match):
-            nonlocal inserted
-            key = match.group(1)
-            if key not in parameters:
-                if fail_on_missing:
-                    raise KeyError(f"Parameter {key} not found in the project")
-                parameters[key] = key
-            else:
-                inserted += 1
-            return f"[]({key}){parameters[key]}[](/)"
-
-        data = re.sub(insert_pattern, replacer, data)
-    with eopen(readme, "w") as f:
-        f.write(data)
-    logger.info(f"Updated {readme} with {inserted} parameters")
+    data = readme.read_text(encoding="utf_8")
+    if "[](" not in data:
+        logger.info("No parameter placeholders found in %s", readme)
+        return 0
+
+    get_param = parameters.get
+
+    def replacer(match):
+        nonlocal inserted
+        key = match.group(1)
+        value = get_param(key)
+        if value is None:
+            if fail_on_missing:
+                raise KeyError(f"Parameter {key} not found in the project")
+            value = key
+        else:
+            inserted += 1
+        return f"[]({key}){value}[](/)"
+
+    updated = _INSERT_RE.sub(replacer, data)
+    if updated == data:
+        logger.info("%s is up to date", readme)
+        return 0
+    # write next to the original and swap, so an interrupted run can't truncate it
+    tmp = readme.with_name(readme.name + ".tmp")
+    tmp.write_text(updated, encoding="utf_8")
+    os.replace(tmp, readme)
+    logger.info("Updated %s with %s parameters", readme, inserted)
     return 0
 
 
@@ -547,6 +779,7 @@ def _register_readme(parser: argparse.ArgumentParser):
 
 
 def _handle_readme(args: argparse.Namespace, parser: argparse.ArgumentParser):
+    args.project_path = args.project_path or find_project_file()
     file_exists(args.project_path) or parser.error(
         "No project file found. Add -h for help"
     )
@@ -585,27 +818,43 @@ def main(argv: Sequence[str] | None = None) -> int:
     ad_grp.add_argument(
         "--altium-path",
         help="Prints the path to Altium Designer executable with specified \
-            version. If not specified, the first version found is returned",
+            version. If not specified, the running instance is returned, \
+            otherwise the newest installed build",
         dest="altium_path",
         metavar="version",
         nargs=argparse.OPTIONAL,
         type=str,
         const="any",
     )
+    ad_grp.add_argument(
+        "--refresh",
+        help="Discards cached AD installations and reads them from registry again",
+        dest="refresh",
+        action="store_true",
+    )
     subparsers = parser.add_subparsers(dest="cmd")
 
     entries = {}
 
-    def subparser(name, subparsers: argparse._SubParsersAction, **kwargs):
+    def subparser(name, subparsers: argparse._SubParsersAction, register, **kwargs):
         sp = subparsers.add_parser(name, **kwargs)
         entries[name] = sp
-        add_verbose(sp)
-        globals()[f"_register_{name.replace('-', '_')}"](sp)
+        if register:
+            add_verbose(sp)
+            globals()[f"_register_{name.replace('-', '_')}"](sp)
         return sp
 
-    subparser("pre-commit", subparsers, help="Pre-commit handling commands")
-    subparser("run", subparsers, help="Run scripts in Altium Designer")
-    subparser("readme", subparsers, help="Update README.md with AD project parameters")
+    commands = {
+        "pre-commit": "Pre-commit handling commands",
+        "run": "Run scripts in Altium Designer",
+        "readme": "Update README.md with AD project parameters",
+    }
+    # only the invoked command needs its arguments, the others are just listed in
+    # help and errors. Without any command (e.g. --version) nothing is registered
+    invoked = next((arg for arg in argv if not arg.startswith("-")), None)
+    for name, cmd_help in commands.items():
+        register = name == invoked or (invoked is not None and invoked not in commands)
+        subparser(name, subparsers, register, help=cmd_help)
 
     if len(argv) == 0:
         return parser.print_help()
@@ -613,14 +862,20 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     if args.verbose:
         o_log.setLevel(logging.INFO)
-
     try:
+        if args.refresh:
+            installs_cache_file.unlink(True)
+            altium_installs.cache_clear()
+
         if args.altiumate_version:
             print(ALTIUMATE_VERSION)
             return 0
         elif args.altium_path:
             print(get_altium_path(args.altium_path))
             return 0
+        elif args.refresh and args.cmd is None:
+            logger.info("Cached AD installations discarded")
+            return 0
         elif args.cmd in entries:
             return globals()[f"_handle_{args.cmd.replace('-', '_')}"](
                 args, entries[args.cmd]
@@ -636,7 +891,8 @@ def main(argv: Sequence[str] | None = None) -> int:
     except Exception as e:
         logger.critical(str(e))
         logger.warning(
-            f"Check log file {(altiumate_dir / '.altiumate.log').absolute()} for more details"
+            "Check log file %s for more details",
+            (altiumate_dir / ".altiumate.log").absolute(),
         )
         return 1
 
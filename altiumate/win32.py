@@ -0,0 +1,204 @@
+import ctypes
+import functools
+import time
+from ctypes import wintypes
+
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+WAIT_OBJECT_0 = 0x00000000
+WAIT_FAILED = 0xFFFFFFFF
+SYNCHRONIZE = 0x00100000
+PROCESS_QUERY_LIMITED_INFORMATION = 0x00001000
+TH32CS_SNAPPROCESS = 0x00000002
+MAX_PATH = 260
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = (
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * MAX_PATH),
+    )
+
+
+@functools.cache
+def kernel32() -> ctypes.CDLL:
+    """Loads kernel32.dll with prototypes of the used functions.
+
+    Raises:
+        AttributeError: If not running on Windows
+    """
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    k32.FindFirstChangeNotificationW.argtypes = (
+        wintypes.LPCWSTR,
+        wintypes.BOOL,
+        wintypes.DWORD,
+    )
+    k32.FindFirstChangeNotificationW.restype = wintypes.HANDLE
+    k32.FindNextChangeNotification.argtypes = (wintypes.HANDLE,)
+    k32.FindNextChangeNotification.restype = wintypes.BOOL
+    k32.FindCloseChangeNotification.argtypes = (wintypes.HANDLE,)
+    k32.FindCloseChangeNotification.restype = wintypes.BOOL
+    k32.WaitForMultipleObjects.argtypes = (
+        wintypes.DWORD,
+        ctypes.POINTER(wintypes.HANDLE),
+        wintypes.BOOL,
+        wintypes.DWORD,
+    )
+    k32.WaitForMultipleObjects.restype = wintypes.DWORD
+    k32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    k32.OpenProcess.restype = wintypes.HANDLE
+    k32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    k32.CloseHandle.restype = wintypes.BOOL
+    k32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    k32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    k32.Process32FirstW.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+    k32.Process32FirstW.restype = wintypes.BOOL
+    k32.Process32NextW.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+    k32.Process32NextW.restype = wintypes.BOOL
+    k32.QueryFullProcessImageNameW.argtypes = (
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.LPWSTR,
+        ctypes.POINTER(wintypes.DWORD),
+    )
+    k32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+    return k32
+
+
+def process_image_path(pid: int) -> str:
+    """Returns full path of the executable of the process with given pid
+
+    Raises:
+        AttributeError: If not running on Windows
+        OSError: If the process could not be opened or queried
+    """
+    k32 = kernel32()
+    handle = k32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        size = wintypes.DWORD(32 * MAX_PATH)
+        buffer = ctypes.create_unicode_buffer(size.value)
+        if not k32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return buffer.value
+    finally:
+        k32.CloseHandle(handle)
+
+
+def find_process(exe_name: str) -> tuple[int, str] | None:
+    """Finds a running process by the name of its executable (case insensitive).
+
+    Walks a single CreateToolhelp32Snapshot, the full path is queried only for \
+        the matching process.
+
+    Returns:
+        tuple[int, str]|None: Pid and full path of the executable if found, else None
+
+    Raises:
+        AttributeError: If not running on Windows
+        OSError: If the process list or the executable path could not be read
+    """
+    k32 = kernel32()
+    snapshot = k32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot in (None, INVALID_HANDLE_VALUE):
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        entry = PROCESSENTRY32W(dwSize=ctypes.sizeof(PROCESSENTRY32W))
+        exe_name = exe_name.lower()
+        found = k32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while found:
+            if entry.szExeFile.lower() == exe_name:
+                pid = entry.th32ProcessID
+                return pid, process_image_path(pid)
+            found = k32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        k32.CloseHandle(snapshot)
+    return None
+
+
+class ChangeNotification:
+    """Waits for files being created, deleted or written in a directory.
+
+    Uses FindFirstChangeNotificationW, falls back to sleeping when change \
+        notifications are not available. Optionally also wakes up when a watched \
+        process exits.
+    """
+
+    def __init__(self, directory, poll_interval: float = 0.3):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._handle = None
+        self._process = None
+
+    @property
+    def active(self) -> bool:
+        return self._handle is not None
+
+    def __enter__(self):
+        try:
+            handle = kernel32().FindFirstChangeNotificationW(
+                str(self.directory),
+                False,
+                FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_LAST_WRITE,
+            )
+        except (AttributeError, OSError):
+            handle = None
+        if handle not in (None, INVALID_HANDLE_VALUE):
+            self._handle = handle
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the notification and process handles, wait() then falls back to sleeping"""
+        if self._process is not None:
+            kernel32().CloseHandle(self._process)
+            self._process = None
+        if self._handle is not None:
+            kernel32().FindCloseChangeNotification(self._handle)
+            self._handle = None
+
+    def watch_process(self, pid: int):
+        """Makes wait() also return when the process with given pid exits"""
+        if self._handle is None:
+            return
+        self._process = kernel32().OpenProcess(SYNCHRONIZE, False, pid) or None
+
+    def wait(self, timeout: float):
+        """Blocks until a change in the directory is signalled, the watched process \
+            exits or timeout seconds pass"""
+        timeout = max(timeout, 0.0)
+        if self._handle is None:
+            return time.sleep(min(timeout, self.poll_interval))
+        k32 = kernel32()
+        handles = [self._handle]
+        if self._process is not None:
+            handles.append(self._process)
+        signalled = k32.WaitForMultipleObjects(
+            len(handles),
+            (wintypes.HANDLE * len(handles))(*handles),
+            False,
+            int(timeout * 1000),
+        )
+        if signalled == WAIT_FAILED:
+            # returns immediately on every call, poll instead of spinning
+            self.close()
+            time.sleep(min(timeout, self.poll_interval))
+        elif signalled == WAIT_OBJECT_0:
+            k32.FindNextChangeNotification(self._handle)
+        elif signalled == WAIT_OBJECT_0 + 1:
+            # an exited process stays signalled, stop waiting on it
+            k32.CloseHandle(self._process)
+            self._process = None